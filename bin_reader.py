@@ -1,11 +1,17 @@
 from __future__ import annotations
 
-from typing import Tuple, Literal
+from typing import List, NamedTuple, Tuple, Literal
 import os
+import struct
 import numpy as np
 
 
-def read_acq_bin(path: str, dtype: Literal["float16", "float32"] = "float16") -> Tuple[np.ndarray, np.ndarray]:
+def read_acq_bin(
+    path: str,
+    dtype: Literal["float16", "float32"] = "float16",
+    copy: bool = False,
+    mmap: bool = False,
+) -> Tuple[np.ndarray, np.ndarray]:
     """
     Read a raw acquisition .bin file produced by the recording feature
     in picoscope_5000_block.
@@ -20,11 +26,20 @@ def read_acq_bin(path: str, dtype: Literal["float16", "float32"] = "float16") ->
     ----------
     path : str
         Path to the .bin file
+    copy : bool
+        If True, return two independently owned arrays instead of views
+        into a single buffer.
+    mmap : bool
+        If True, return read-only views into a ``numpy.memmap`` of the file
+        instead of reading it; only the pages actually touched are loaded,
+        which suits very large recordings. Ignored when `copy` is True.
 
     Returns
     -------
     (a, b) : Tuple[np.ndarray, np.ndarray]
         Two 1-D arrays of dtype matching `dtype` with Channel A and Channel B samples.
+        Unless `copy` is True, both are views into one buffer read from disk, so
+        no extra copy of the payload is made.
 
     Raises
     ------
@@ -32,18 +47,106 @@ def read_acq_bin(path: str, dtype: Literal["float16", "float32"] = "float16") ->
         If the provided path does not exist.
     ValueError
         If the file size is not compatible with the expected layout
-        (i.e., number of float32 values is not even).
+        (i.e., number of `dtype` values is not even).
     """
     if not os.path.isfile(path):
         raise FileNotFoundError(f"No such file: {path}")
 
-    dt = np.float16 if dtype == "float16" else np.float32
-    data = np.fromfile(path, dtype=dt)
-    if data.size % 2 != 0:
+    dt = np.dtype(np.float16 if dtype == "float16" else np.float32)
+    size = os.path.getsize(path) // dt.itemsize
+    if size % 2 != 0:
         raise ValueError(
-            f"Invalid file size: expected an even number of float32 values, got {data.size}"
+            f"Invalid file size: expected an even number of {dtype} values, got {size}"
         )
-    n = data.size // 2
-    a = data[:n].copy()
-    b = data[n:].copy()
+    n = size // 2
+    if mmap and not copy and size:
+        # mode="r" keeps the views read-only; use np.memmap(..., mode="c") directly
+        # for writable copy-on-write views that never touch the file
+        mm = np.memmap(path, dtype=dt, mode="r", shape=(size,))
+        return mm[:n], mm[n:]
+    data = np.empty(size, dtype=dt)
+    with open(path, "rb") as f:
+        f.readinto(data.view(np.uint8))
+    a = data[:n]
+    b = data[n:]
+    if copy:
+        return a.copy(), b.copy()
     return a, b
+
+
+class SessionRecord(NamedTuple):
+    index: int
+    timestamp_ns: int
+    a: np.ndarray
+    b: np.ndarray
+    scale_a: float
+    scale_b: float
+
+
+def read_session_bin(
+    path: str,
+    volts: bool = True,
+    mmap: bool = False,
+) -> List[SessionRecord]:
+    """
+    Read a recording session file ("session_000.bin", ...).
+
+    Format:
+        A sequence of records, one per acquisition, each made of
+    - a little-endian header "<IqIff": acquisition index (uint32), timestamp
+      in ns since the epoch (int64), samples per channel n (uint32) and the
+      Channel A and B volts per ADC count (float32)
+    - n int16 Channel A ADC counts, then n int16 Channel B ADC counts
+
+    Parameters
+    ----------
+    path : str
+        Path to the session file
+    volts : bool
+        If True (default), a and b are float32 volts (counts * scale). If False,
+        they are the stored int16 counts, as views into the file buffer.
+    mmap : bool
+        If True, the file buffer is a read-only ``numpy.memmap`` instead of one
+        buffer read into memory; best combined with volts=False.
+
+    Returns
+    -------
+    records : List[SessionRecord]
+        (index, timestamp_ns, a, b, scale_a, scale_b) per acquisition, in file order.
+
+    Raises
+    ------
+    FileNotFoundError
+        If the provided path does not exist.
+    ValueError
+        If the file ends in the middle of a record.
+    """
+    if not os.path.isfile(path):
+        raise FileNotFoundError(f"No such file: {path}")
+
+    size = os.path.getsize(path)
+    if mmap and size:
+        buf = np.memmap(path, dtype=np.uint8, mode="r", shape=(size,))
+    else:
+        buf = np.empty(size, dtype=np.uint8)
+        with open(path, "rb") as f:
+            f.readinto(buf)
+    hdr = struct.Struct("<IqIff")  # bin_writer.SESSION_HEADER; kept here so this file stands alone
+    records = []
+    pos = 0
+    while pos < size:
+        if pos + hdr.size > size:
+            raise ValueError(f"Truncated record header at byte {pos}")
+        index, ts_ns, n, scale_a, scale_b = hdr.unpack_from(buf, pos)
+        pos += hdr.size
+        end = pos + 4 * n
+        if end > size:
+            raise ValueError(f"Truncated record {index} at byte {pos}")
+        ab = buf[pos:end].view("<i2")
+        a, b = ab[:n], ab[n:]
+        if volts:
+            a = np.multiply(a, scale_a, dtype=np.float32)
+            b = np.multiply(b, scale_b, dtype=np.float32)
+        records.append(SessionRecord(index, ts_ns, a, b, scale_a, scale_b))
+        pos = end
+    return records
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+import os
+import queue
+import struct
+import threading
+import time
+import numpy as np
+
+# Per-acquisition record header in session files: acquisition index, wall-clock
+# timestamp (ns since the epoch), samples per channel and the Channel A / B volts
+# per ADC count; int16 counts for A then B follow
+SESSION_HEADER = struct.Struct("<IqIff")
+SESSION_ROLLOVER_BYTES = 512 * 1024 * 1024
+
+
+class SessionBinWriter:
+    """
+    Background writer for the recording feature's session files
+    (read back with bin_reader.read_session_bin).
+
+    Acquisitions are appended as records to ``session_000.bin``, rolling over
+    to ``session_001.bin`` and so on once a file reaches `rollover_bytes`, so a
+    recording is a few large sequential files instead of one file per capture.
+    Samples are stored as the raw int16 ADC counts with their scale in the
+    record header, so nothing is converted on the way to disk. Files are
+    written from a worker thread to keep disk latency out of the frame budget;
+    `submit` never blocks: when `depth` captures are already waiting for disk
+    the capture is dropped and counted in `dropped`.
+
+    Parameters
+    ----------
+    folder : str
+        Destination directory.
+    depth : int
+        Number of captures that may wait for disk.
+    rollover_bytes : int
+        Start a new session file before one would grow past this size.
+    """
+
+    def __init__(self, folder: str, depth: int = 8, rollover_bytes: int = SESSION_ROLLOVER_BYTES):
+        self._folder = folder
+        self._rollover_bytes = int(rollover_bytes)
+        self._todo: "queue.Queue[Optional[Tuple[int, int, np.ndarray, np.ndarray]]]" = queue.Queue()
+        self._slots = threading.Semaphore(max(1, depth))
+        # Names of the session files written so far, in order
+        self.files: List[str] = []
+        # Captures refused because the disk fell behind
+        self.dropped = 0
+        # Last write failure, reported by the caller; the worker keeps going
+        self.error: Optional[OSError] = None
+        self._thread = threading.Thread(target=self._run, name="SessionBinWriter", daemon=True)
+        self._thread.start()
+
+    def submit(self, index: int, counts_ab: np.ndarray, scales: np.ndarray) -> bool:
+        """Queue acquisition `index` as a record.
+
+        `counts_ab` is a (2, n) int16 array of Channel A and B ADC counts that the
+        writer takes ownership of; `scales` holds the two volts-per-count factors.
+        Returns False, and counts the capture in `dropped`, if the queue is full.
+        """
+        ts_ns = time.time_ns()
+        if not self._slots.acquire(blocking=False):
+            self.dropped += 1
+            return False
+        self._todo.put((index, ts_ns, counts_ab, scales))
+        return True
+
+    def close(self) -> None:
+        """Write everything still queued, then stop the worker."""
+        self._todo.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        f = None
+        written = 0
+        try:
+            while True:
+                item = self._todo.get()
+                if item is None:
+                    return
+                index, ts_ns, counts_ab, scales = item
+                try:
+                    size = SESSION_HEADER.size + counts_ab.nbytes
+                    if f is None or (written and written + size > self._rollover_bytes):
+                        if f is not None:
+                            f.close()
+                            f = None
+                        name = f"session_{len(self.files):03d}.bin"
+                        f = open(os.path.join(self._folder, name), "wb")
+                        self.files.append(name)
+                        written = 0
+                    scale_a, scale_b = (float(v) for v in np.ravel(scales))
+                    f.write(SESSION_HEADER.pack(index, ts_ns, counts_ab.shape[1], scale_a, scale_b))
+                    # The rows are contiguous, so one write covers A then B
+                    np.ascontiguousarray(counts_ab, dtype="<i2").tofile(f)
+                    written += size
+                except OSError as e:
+                    self.error = e
+                finally:
+                    self._slots.release()
+        finally:
+            if f is not None:
+                f.close()
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 import os
+import math
 import time
 import threading
 import ctypes
+from collections import OrderedDict, deque
 from dataclasses import dataclass
+from typing import Callable
+from functools import lru_cache
 from ctypes import (
-    byref, c_int16, c_int32, c_uint32, c_float, c_double, c_void_p,
+    byref, c_char_p, c_int16, c_int32, c_uint32, c_float, c_double, c_void_p,
     POINTER, WINFUNCTYPE
 )
 from ctypes.util import find_library
@@ -17,14 +21,45 @@ from picoscope_constants import (
     PS5000A_CHANNEL_B,
     PS5000A_AC,
     PS5000A_DC,
-    RANGE_TO_VOLTS,
+    RANGE_VOLTS_BY_CODE,
     PS5000A_RATIO_MODE_NONE,
     PS5000A_DR_8BIT,
+    PS5000A_DR_12BIT,
+    PS5000A_DR_14BIT,
+    PS5000A_DR_15BIT,
     PICO_OK,
     PICO_POWER_SUPPLY_CONNECTED,
     PICO_POWER_SUPPLY_NOT_CONNECTED,
     _status_text,
 )
+# ps5000aBlockReady(handle, status, pParameter): invoked by the driver when a block completes
+BlockReadyType = WINFUNCTYPE(None, c_int16, c_int32, c_void_p)
+
+# Constant ctypes arguments for the control calls (trigger, channel setup); never mutated
+_C_ON = c_int16(1)
+_C_OFF = c_int16(0)
+_C_ZERO_I32 = c_int32(0)
+_C_NO_OFFSET = c_float(0.0)
+
+# (name, argtypes, restype) for every ps5000a entry point the block driver calls
+_PS5000A_SIGS = (
+    ("ps5000aOpenUnit", [POINTER(c_int16), c_char_p, c_int32], c_int32),
+    ("ps5000aCloseUnit", [c_int16], c_int32),
+    ("ps5000aChangePowerSource", [c_int16, c_uint32], c_int32),
+    ("ps5000aSetChannel", [c_int16, c_int32, c_int16, c_int32, c_int32, c_float], c_int32),
+    ("ps5000aSetDataBuffer", [c_int16, c_int32, POINTER(c_int16), c_int32, c_uint32, c_int32], c_int32),
+    ("ps5000aRunBlock", [c_int16, c_int32, c_int32, c_uint32, POINTER(c_int32), c_uint32, BlockReadyType, c_void_p], c_int32),
+    ("ps5000aIsReady", [c_int16, POINTER(c_int16)], c_int32),
+    ("ps5000aStop", [c_int16], c_int32),
+    ("ps5000aGetValues", [c_int16, c_uint32, POINTER(c_uint32), c_uint32, c_int32, c_uint32, POINTER(c_int16)], c_int32),
+    ("ps5000aGetValuesBulk", [c_int16, POINTER(c_uint32), c_uint32, c_uint32, c_uint32, c_int32, POINTER(c_int16)], c_int32),
+    ("ps5000aMaximumValue", [c_int16, POINTER(c_int16)], c_int32),
+    ("ps5000aGetTimebase2", [c_int16, c_uint32, c_int32, POINTER(c_float), c_int16, c_uint32], c_int32),
+    ("ps5000aMemorySegments", [c_int16, c_uint32, POINTER(c_uint32)], c_int32),
+    ("ps5000aSetNoOfCaptures", [c_int16, c_uint32], c_int32),
+    ("ps5000aSetSimpleTrigger", [c_int16, c_int16, c_int32, c_int16, c_int32, c_int32, c_int32], c_int32),
+)
+
 # Local SDK error helpers (decoupled from streaming driver)
 class PicoSDKError(RuntimeError):
     pass
@@ -34,6 +69,9 @@ _PICO_VERBOSE = bool(os.environ.get("PICO_VERBOSE", "").strip())
 
 def _check_status(status: int, where: str) -> None:
     code = int(status)
+    if code == PICO_OK and not _PICO_VERBOSE:
+        # Fast path: one integer test, no formatting
+        return
     if _PICO_VERBOSE:
         try:
             msg = _status_text(status)
@@ -50,6 +88,46 @@ def _check_status(status: int, where: str) -> None:
         raise PicoSDKError(f"{where} failed: {err}")
 
 
+def _timebase_for_interval(dt_ns: float, resolution: int) -> int:
+    """Smallest ps5000a timebase whose sample interval is >= dt_ns (programmer's guide formulas)."""
+    dt_ns = max(float(dt_ns), 1.0)
+    if resolution == PS5000A_DR_8BIT:
+        # tb 0..2: 2^tb ns; tb >= 3: (tb - 2) * 8 ns
+        if dt_ns <= 4.0:
+            return int(math.ceil(math.log2(dt_ns)))
+        return int(math.ceil(dt_ns / 8.0)) + 2
+    if resolution == PS5000A_DR_12BIT:
+        # tb 1..3: 2^(tb - 1) * 2 ns; tb >= 4: (tb - 3) * 16 ns
+        if dt_ns <= 8.0:
+            return max(1, int(math.ceil(math.log2(dt_ns))))
+        return int(math.ceil(dt_ns / 16.0)) + 3
+    if resolution in (PS5000A_DR_14BIT, PS5000A_DR_15BIT):
+        # tb >= 3: (tb - 2) * 8 ns
+        return max(3, int(math.ceil(dt_ns / 8.0)) + 2)
+    # 16-bit: tb >= 4: (tb - 3) * 16 ns
+    return max(4, int(math.ceil(dt_ns / 16.0)) + 3)
+
+
+def _aligned_int16_rows(rows: int, n: int, align: int = 64) -> np.ndarray:
+    # (rows, n) int16 view whose rows each start on an `align`-byte boundary (rows are
+    # padded to a multiple of it), so SIMD loads over a row never split a cache line
+    row = -(-n * 2 // align) * align // 2
+    raw = np.empty(rows * row + align // 2, dtype=np.int16)
+    off = (-raw.ctypes.data % align) // 2
+    return raw[off:off + rows * row].reshape(rows, row)[:, :n]
+
+
+def _minmax_envelope(raw_ab: np.ndarray, n: int, stride: int, scales: np.ndarray,
+                     env: np.ndarray, out: np.ndarray) -> None:
+    # Min and max of each of n buckets on the int16 counts (scales are positive, so the
+    # order survives scaling), then scaled into out as (2, 2n) min/max pairs
+    blocks = raw_ab[:, :n * stride].reshape(2, n, stride)
+    np.min(blocks, axis=2, out=env[:, :, 0])
+    np.max(blocks, axis=2, out=env[:, :, 1])
+    np.multiply(env.reshape(2, 2 * n), scales, out=out, dtype=np.float32)
+
+
+@lru_cache(maxsize=1)
 def _find_ps5000a_dll() -> str:
     env_path = os.environ.get("PICO_PS5000A_DLL", "").strip()
     if env_path and os.path.isfile(env_path):
@@ -74,6 +152,18 @@ def _find_ps5000a_dll() -> str:
     )
 
 
+@lru_cache(maxsize=1)
+def _load_ps5000a_dll() -> ctypes.WinDLL:
+    # Loaded once per process; every PicoScopeRapidBlock shares the same handle
+    dll_path = _find_ps5000a_dll()
+    try:
+        if hasattr(os, "add_dll_directory"):
+            os.add_dll_directory(os.path.dirname(dll_path))
+    except Exception:
+        pass
+    return ctypes.WinDLL(dll_path)
+
+
 @dataclass
 class BlockConfig:
     sample_interval_ns: int = 100  # 10 MHz
@@ -94,17 +184,17 @@ class BlockConfig:
     trigger_threshold_pct: float = 0.0
     trigger_direction: int = 2  # rising
 
+    # Rapid block: captures (memory segments) acquired per RunBlock and fetched with one GetValuesBulk
+    captures_per_block: int = 1
+
 
 class PicoScopeRapidBlock:
+    _SLOTS = 4
+
     def __init__(self, cfg: BlockConfig):
         self.cfg = cfg
         self._dll_path = _find_ps5000a_dll()
-        try:
-            if hasattr(os, "add_dll_directory"):
-                os.add_dll_directory(os.path.dirname(self._dll_path))
-        except Exception:
-            pass
-        self.ps = ctypes.WinDLL(self._dll_path)
+        self.ps = _load_ps5000a_dll()
 
         self.handle = c_int16(0)
         self.max_adc = c_int16(32767)
@@ -112,75 +202,108 @@ class PicoScopeRapidBlock:
         self._lock = threading.Lock()
         self._running = False
         self._thread: threading.Thread | None = None
+        # Set by stop(); wakes both the block wait and the pacing wait immediately
+        self._stop_evt = threading.Event()
+        # Block completion is signalled by the driver callback instead of polling IsReady
+        self._ready_evt = threading.Event()
+        self._ready_status = PICO_OK
+        self._ready_cb = BlockReadyType(self._on_block_ready)
+        # Settings handed to the capture thread while running, and the flag that aborts the current block
+        self._pending_ops: deque[Callable[[], None]] = deque()
+        self._abort = False
+        # Serializes SDK calls between the capture thread and the GUI thread (stop(), and
+        # settings applied while idle); never held across the block wait
+        self._sdk_lock = threading.Lock()
+        # Last failure of a setting applied on the capture thread, reported by the caller
+        self.error: PicoSDKError | None = None
 
         self._dt_s = self.cfg.sample_interval_ns * 1e-9
         self._n_samples = self.cfg.plot_max_points
         self._window_s = self._n_samples * self._dt_s
-        self._buf_a = (c_int16 * self._n_samples)()
-        self._buf_b = (c_int16 * self._n_samples)()
-
-        self._y_a = np.zeros(self._n_samples, dtype=np.float32)
-        self._y_b = np.zeros(self._n_samples, dtype=np.float32)
-        self._t = np.linspace(0.0, self._window_s - self._dt_s, self._n_samples, dtype=np.float64)
+        # SPSC ring of capture slots: the loop fills slots from _head & _slot_mask and then
+        # publishes them by bumping _head, so readers never see a half-written frame.
+        # Each rapid-block capture needs its own slot, plus headroom for the reader.
+        # The slot count is a power of two so _head never needs a modulo.
+        self._captures = int(max(1, self.cfg.captures_per_block))
+        self._n_slots = 1 << (max(self._SLOTS, 2 * self._captures) - 1).bit_length()
+        self._slot_mask = self._n_slots - 1
+        self._slots: list[tuple[ctypes._Pointer, ctypes._Pointer, np.ndarray]] = []
+        self._slot_counts: list[int] = []
+        self._slot_scales: list[np.ndarray] = []
+        self._cap = 0
+        self._head = 0
+        # Total captures published; unlike _head it is never reset by _alloc_slots()
+        self._published = 0
+        # Read-only time axes keyed by (n_points, stride, dt_s); only a few sizes are ever live.
+        # Only the capture thread (_prepare_display) builds them
+        self._t_cache: OrderedDict[tuple[int, int, float], np.ndarray] = OrderedDict()
+        # Display frames built on the capture thread: (y_ab, t) envelopes of the newest
+        # capture, double-buffered and published by bumping _disp_head (latest_display())
+        empty = np.empty((2, 0), dtype=np.float32)
+        self._frames: list[tuple[np.ndarray, np.ndarray]] = [(empty, np.empty(0))] * 2
+        self._frame_env = [np.empty((2, 0, 2), dtype=np.int16)] * 2
+        self._frame_y = [empty] * 2
+        self._disp_head = 0
+        self._recompute_scales()
+        self._alloc_slots()
 
         self._bind_functions()
         self._timebase = c_uint32(0)
         self._max_samples_per_segment = c_uint32(0)
 
     def _bind_functions(self) -> None:
-        from ctypes import c_char_p
-        self.ps.ps5000aOpenUnit.argtypes = [POINTER(c_int16), c_char_p, c_int32]
-        self.ps.ps5000aOpenUnit.restype = c_int32
-        self.ps.ps5000aCloseUnit.argtypes = [c_int16]
-        self.ps.ps5000aCloseUnit.restype = c_int32
-        self.ps.ps5000aSetChannel.argtypes = [c_int16, c_int32, c_int16, c_int32, c_int32, c_float]
-        self.ps.ps5000aSetChannel.restype = c_int32
-        self.ps.ps5000aSetDataBuffer.argtypes = [c_int16, c_int32, POINTER(c_int16), c_int32, c_uint32, c_int32]
-        self.ps.ps5000aSetDataBuffer.restype = c_int32
-        self.ps.ps5000aRunBlock.argtypes = [c_int16, c_int32, c_int32, c_uint32, POINTER(c_int32), c_uint32, c_void_p, c_void_p]
-        self.ps.ps5000aRunBlock.restype = c_int32
-        self.ps.ps5000aIsReady.argtypes = [c_int16, POINTER(c_int16)]
-        self.ps.ps5000aIsReady.restype = c_int32
-        self.ps.ps5000aGetValues.argtypes = [c_int16, c_uint32, POINTER(c_uint32), c_uint32, c_int32, c_uint32, POINTER(c_int16)]
-        self.ps.ps5000aGetValues.restype = c_int32
-        self.ps.ps5000aMaximumValue.argtypes = [c_int16, POINTER(c_int16)]
-        self.ps.ps5000aMaximumValue.restype = c_int32
-        self.ps.ps5000aGetTimebase2.argtypes = [c_int16, c_uint32, c_int32, POINTER(c_float), c_int16, c_uint32]
-        self.ps.ps5000aGetTimebase2.restype = c_int32
-        self.ps.ps5000aMemorySegments.argtypes = [c_int16, c_uint32, POINTER(c_uint32)]
-        self.ps.ps5000aMemorySegments.restype = c_int32
-        self.ps.ps5000aSetNoOfCaptures.argtypes = [c_int16, c_uint32]
-        self.ps.ps5000aSetNoOfCaptures.restype = c_int32
-        self.ps.ps5000aSetSimpleTrigger.argtypes = [c_int16, c_int16, c_int32, c_int16, c_int32, c_int32, c_int32]
-        self.ps.ps5000aSetSimpleTrigger.restype = c_int32
+        # Prototypes live on the shared DLL object, so only the first instance sets them
+        if not getattr(self.ps, "_bound", False):
+            for name, argtypes, restype in _PS5000A_SIGS:
+                fn = getattr(self.ps, name)
+                fn.argtypes = argtypes
+                fn.restype = restype
+            self.ps._bound = True
+        # Hot-loop bindings: resolve the WinDLL attributes once instead of on every capture
+        self._SetDataBufferFn = self.ps.ps5000aSetDataBuffer
+        self._RunBlockFn = self.ps.ps5000aRunBlock
+        self._GetValuesFn = self.ps.ps5000aGetValues
+        self._GetValuesBulkFn = self.ps.ps5000aGetValuesBulk
+        # Constant call arguments reused by every capture
+        self._c_zero_i32 = c_int32(0)
+        self._c_zero_u32 = c_uint32(0)
+        self._c_one_u32 = c_uint32(1)
+        self._c_ratio_none = c_int32(PS5000A_RATIO_MODE_NONE)
+        # Out-parameters reused by every capture; only .value is reset per call
+        self._c_time_indisposed = c_int32(0)
+        self._c_n_samps = c_uint32(0)
+        self._c_overflow = c_int16(0)
+        # byref() builds a new argument object per call; these stay valid as long as the targets
+        self._ref_time_indisposed = byref(self._c_time_indisposed)
+        self._ref_n_samps = byref(self._c_n_samps)
+        self._ref_overflow = byref(self._c_overflow)
 
     def open(self) -> None:
-        from ctypes import c_char_p
         status = self.ps.ps5000aOpenUnit(byref(self.handle), c_char_p(None), c_int32(self.cfg.resolution))
         code = int(status)
         if code in (PICO_POWER_SUPPLY_NOT_CONNECTED, PICO_POWER_SUPPLY_CONNECTED):
             self.ps.ps5000aChangePowerSource(self.handle, c_uint32(code))
         self.ps.ps5000aMaximumValue(self.handle, byref(self.max_adc))
+        self._recompute_scales()
         # Channels
-        st = self.ps.ps5000aSetChannel(self.handle, PS5000A_CHANNEL_A, 1, self.cfg.coupling, self.cfg.range_a, c_float(0.0))
+        st = self.ps.ps5000aSetChannel(self.handle, PS5000A_CHANNEL_A, 1, self.cfg.coupling, self.cfg.range_a, _C_NO_OFFSET)
         _check_status(st, "ps5000aSetChannel(A)")
-        st = self.ps.ps5000aSetChannel(self.handle, PS5000A_CHANNEL_B, 1, self.cfg.coupling, self.cfg.range_b, c_float(0.0))
+        st = self.ps.ps5000aSetChannel(self.handle, PS5000A_CHANNEL_B, 1, self.cfg.coupling, self.cfg.range_b, _C_NO_OFFSET)
         _check_status(st, "ps5000aSetChannel(B)")
-        # Segments: single segment; fetch max samples per segment and clamp request
+        # Segments: one per rapid-block capture; fetch max samples per segment and clamp request
         max_samples = c_uint32(0)
-        st = self.ps.ps5000aMemorySegments(self.handle, c_uint32(1), byref(max_samples))
+        st = self.ps.ps5000aMemorySegments(self.handle, c_uint32(self._captures), byref(max_samples))
         _check_status(st, "ps5000aMemorySegments")
+        st = self.ps.ps5000aSetNoOfCaptures(self.handle, c_uint32(self._captures))
+        _check_status(st, "ps5000aSetNoOfCaptures")
         self._max_samples_per_segment = max_samples
         # Clamp requested samples to device limit
         max_allowed = int(self._max_samples_per_segment.value)
         if self._n_samples > max_allowed:
             self._n_samples = max_allowed
-            # Rebuild buffers to clamped size
-            self._buf_a = (c_int16 * self._n_samples)()
-            self._buf_b = (c_int16 * self._n_samples)()
-            self._y_a = np.zeros(self._n_samples, dtype=np.float32)
-            self._y_b = np.zeros(self._n_samples, dtype=np.float32)
-            self._t = np.linspace(0.0, self._window_s - self._dt_s, self._n_samples, dtype=np.float64)
+            # Refresh slots for the clamped size
+            with self._lock:
+                self._alloc_slots()
         time.sleep(self.cfg.connect_delay_ms/1000.0)
         # Trigger setup: autotrigger equals plot refresh to simulate free running
         self.apply_trigger(self.cfg.simple_trigger_enabled, self.cfg.trigger_threshold_pct)
@@ -196,14 +319,145 @@ class PicoScopeRapidBlock:
             except Exception:
                 pass
 
+    def _alloc_slots(self) -> None:
+        # Grow-only: slot buffers are reused whenever _n_samples fits the current
+        # capacity; SDK calls and numpy views are always limited to _n_samples
+        n = self._n_samples
+        if n > self._cap:
+            self._slots = []
+            for _ in range(self._n_slots):
+                # One (2, n) int16 block per slot: row 0 is channel A, row 1 channel B, both
+                # 64-byte aligned. np.empty is a single malloc with no zero-fill; the SDK
+                # overwrites it anyway
+                raw_ab = _aligned_int16_rows(2, n)
+                buf_a = raw_ab[0].ctypes.data_as(POINTER(c_int16))
+                buf_b = raw_ab[1].ctypes.data_as(POINTER(c_int16))
+                self._slots.append((buf_a, buf_b, raw_ab))
+            self._cap = n
+        # Nothing published at the new size yet
+        self._slot_counts = [0] * self._n_slots
+        self._slot_scales = [self._scales] * self._n_slots
+        self._head = 0
+
+    def _t_axis(self, n: int, stride: int = 1) -> np.ndarray:
+        # Sample times of n samples, or of n min/max buckets of `stride` samples each
+        # (two points per bucket, both at its centre) when decimated
+        key = (n, stride, self._dt_s)
+        t = self._t_cache.get(key)
+        if t is None:
+            t = (np.arange(n, dtype=np.float64) * stride + stride // 2) * self._dt_s
+            if stride > 1:
+                t = np.repeat(t, 2)
+            t.flags.writeable = False
+            self._t_cache[key] = t
+            if len(self._t_cache) > 8:
+                self._t_cache.popitem(last=False)
+        else:
+            self._t_cache.move_to_end(key)
+        return t
+
+    @property
+    def captures_published(self) -> int:
+        """Monotonic count of published captures; unchanged means there is nothing new to read."""
+        return self._published
+
+    def captures_since(self, seen: int, raw: bool = False) -> tuple[int, list[tuple[np.ndarray, np.ndarray]], int]:
+        """Return (published, [(y_a, y_b), ...], skipped) for captures published after `seen`.
+
+        `seen` is an earlier captures_published value; the list is oldest first and
+        at full resolution in volts. With raw=True each entry is instead
+        (counts_ab, scales): an owned (2, n) int16 copy of the ADC counts and the
+        (2, 1) float32 volts-per-count the capture was taken with. Only the captures
+        still held in the slot ring (and since the last reallocation) can be
+        returned; `skipped` is how many older ones were overwritten before this call.
+        Lock-free on the slots: _head doubles as the publish generation and is re-read
+        after the copies to detect slots overwritten (or reallocated) mid-read.
+        """
+        while True:
+            with self._lock:
+                g1, p1 = self._head, self._published
+            slots, counts, scales = self._slots, self._slot_counts, self._slot_scales
+            k = max(0, min(p1 - seen, g1, len(slots) - self._captures))
+            out = []
+            for g in range(g1 - k, g1):
+                i = g & (len(slots) - 1)
+                if raw:
+                    out.append((slots[i][2][:, :counts[i]].copy(), scales[i]))
+                else:
+                    y_ab = np.multiply(slots[i][2][:, :counts[i]], scales[i], dtype=np.float32)
+                    out.append((y_ab[0], y_ab[1]))
+            # The producer fills up to `captures` slots ahead of _head; the oldest of the k
+            # slots read is safe while it has not advanced into it
+            if 0 <= self._head - g1 <= len(slots) - self._captures - max(k, 1):
+                return p1, out, p1 - seen - k
+
+    def latest_display(self, gains: np.ndarray | None = None,
+                       out: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return (t, y_a, y_b) for the newest capture, decimated to cfg.plot_max_points.
+
+        The envelope is computed on the capture thread as each block is published, so
+        this only reads a few thousand values; t is a shared read-only axis. With gains
+        ((2, 1) per-channel factors) the single pass out of the frame also applies them,
+        instead of a copy followed by an in-place multiply. With out (a float32 array of
+        shape (2, >= cfg.plot_max_points)) that pass writes into it and y_a/y_b are views
+        of it, so steady-state reads allocate nothing.
+        """
+        while True:
+            g1 = self._disp_head
+            src, t = self._frames[g1 & 1]
+            y_ab = np.empty_like(src) if out is None else out[:, :src.shape[1]]
+            if gains is None:
+                np.copyto(y_ab, src)
+            else:
+                np.multiply(src, gains, out=y_ab)
+            # The producer only rewrites this frame two publishes later
+            if self._disp_head == g1:
+                return t, y_ab[0], y_ab[1]
+
+    def _prepare_display(self, slot: int, cnt: int, scales: np.ndarray) -> None:
+        # Capture thread: build the next display frame off the GUI thread, then publish it
+        max_points = self.cfg.plot_max_points
+        stride = 1 if cnt <= max_points else -(-cnt // max(1, max_points // 2))
+        k = (self._disp_head + 1) & 1
+        raw_ab = self._slots[slot][2]
+        # Frame buffers are rewritten in place and only reallocated when the width changes
+        n = cnt if stride == 1 else cnt // stride
+        width = n if stride == 1 else 2 * n
+        if self._frame_y[k].shape[1] != width:
+            self._frame_y[k] = np.empty((2, width), dtype=np.float32)
+        y_ab = self._frame_y[k]
+        if stride == 1:
+            np.multiply(raw_ab[:, :n], scales, out=y_ab)
+        else:
+            if self._frame_env[k].shape[1] != n:
+                self._frame_env[k] = np.empty((2, n, 2), dtype=np.int16)
+            _minmax_envelope(raw_ab, n, stride, scales, self._frame_env[k], y_ab)
+        self._frames[k] = (y_ab, self._t_axis(n, stride))
+        self._disp_head += 1
+
+    def _on_block_ready(self, handle: int, status: int, p_parameter) -> None:
+        # Runs on the driver's thread: record status and wake the capture loop
+        self._ready_status = int(status)
+        self._ready_evt.set()
+
     def _find_timebase(self, num_samples: int) -> int:
-        # Walk timebase indices until interval >= requested dt
         desired_dt = float(self.cfg.sample_interval_ns)
-        tb = 0
         tmp_dt = c_float(0.0)
-        while tb < 50_000:
+
+        def _query(tb: int) -> bool:
             st = self.ps.ps5000aGetTimebase2(self.handle, c_uint32(tb), c_int32(num_samples), byref(tmp_dt), c_int16(0), c_uint32(0))
-            if int(st) == PICO_OK and (tmp_dt.value >= desired_dt or tb > 0 and tmp_dt.value > 0):
+            return int(st) == PICO_OK and tmp_dt.value > 0
+
+        # Closed-form guess, confirmed with a single GetTimebase2 call
+        guess = _timebase_for_interval(desired_dt, self.cfg.resolution)
+        for tb in (guess, guess + 1, guess - 1):
+            if tb >= 0 and _query(tb) and tmp_dt.value >= desired_dt:
+                self._dt_s = float(tmp_dt.value) * 1e-9
+                return tb
+        # Fallback: walk timebase indices until interval >= requested dt
+        tb = 0
+        while tb < 50_000:
+            if _query(tb) and tmp_dt.value >= desired_dt:
                 self._dt_s = float(tmp_dt.value) * 1e-9
                 return tb
             tb += 1
@@ -214,120 +468,193 @@ class PicoScopeRapidBlock:
         self.cfg.simple_trigger_enabled = bool(enabled)
         self.cfg.trigger_threshold_pct = float(threshold_pct)
         ch = self.cfg.trigger_source
-        rng = self.cfg.range_a if ch == PS5000A_CHANNEL_A else self.cfg.range_b
-        fs_v = float(RANGE_TO_VOLTS.get(rng, 2.0))
         max_adc = float(self.max_adc.value if self.max_adc.value != 0 else 32767.0)
         counts = int(round(threshold_pct * max_adc))
-        # Disable autotrigger: require an actual trigger event
-        auto_ms = 0
+        # Delay and autotrigger are always 0: require an actual trigger event
+        direction = c_int32(self.cfg.trigger_direction)
         if enabled:
-            st = self.ps.ps5000aSetSimpleTrigger(
-                self.handle,
-                c_int16(1),
-                c_int32(ch),
-                c_int16(counts),
-                c_int32(self.cfg.trigger_direction),
-                c_int32(0),
-                c_int32(auto_ms),
-            )
-            _check_status(st, "ps5000aSetSimpleTrigger(enable)")
+            args = (_C_ON, c_int32(ch), c_int16(counts), direction, _C_ZERO_I32, _C_ZERO_I32)
+            where = "ps5000aSetSimpleTrigger(enable)"
         else:
             # Disable trigger; set autotrigger to minimal to free-run
-            st = self.ps.ps5000aSetSimpleTrigger(
-                self.handle,
-                c_int16(0),
-                c_int32(ch),
-                c_int16(0),
-                c_int32(self.cfg.trigger_direction),
-                c_int32(0),
-                c_int32(0),
-            )
-            _check_status(st, "ps5000aSetSimpleTrigger(disable)")
+            args = (_C_OFF, c_int32(ch), _C_OFF, direction, _C_ZERO_I32, _C_ZERO_I32)
+            where = "ps5000aSetSimpleTrigger(disable)"
+
+        def _apply() -> None:
+            st = self.ps.ps5000aSetSimpleTrigger(self.handle, *args)
+            _check_status(st, where)
+
+        self._submit(_apply)
 
     def set_range(self, channel: int, new_range: int) -> None:
-        st = self.ps.ps5000aSetChannel(self.handle, channel, 1, self.cfg.coupling, new_range, c_float(0.0))
-        _check_status(st, f"ps5000aSetChannel({'A' if channel==PS5000A_CHANNEL_A else 'B'})")
-        if channel == PS5000A_CHANNEL_A:
-            self.cfg.range_a = new_range
-        else:
-            self.cfg.range_b = new_range
+        # Validated once here so the scale lookup below can index the table directly
+        if not 0 <= new_range < len(RANGE_VOLTS_BY_CODE):
+            raise ValueError(f"Invalid range code: {new_range}")
+
+        def _apply() -> None:
+            st = self.ps.ps5000aSetChannel(self.handle, channel, 1, self.cfg.coupling, new_range, _C_NO_OFFSET)
+            _check_status(st, f"ps5000aSetChannel({'A' if channel==PS5000A_CHANNEL_A else 'B'})")
+            # cfg only follows the hardware once the SDK has accepted the range
+            if channel == PS5000A_CHANNEL_A:
+                self.cfg.range_a = new_range
+            else:
+                self.cfg.range_b = new_range
+            self._recompute_scales()
+
+        self._submit(_apply)
+
+    def _submit(self, op: Callable[[], None]) -> None:
+        # Channel/trigger settings: applied directly when idle; while capturing they are
+        # handed to the capture thread, which owns the SDK between blocks, and the block
+        # in flight (possibly waiting on a trigger) is aborted so they take effect now
+        if not self._running:
+            with self._sdk_lock:
+                op()
+            return
+        # The GUI thread makes no SDK call here: waking the block wait is enough, and the
+        # capture thread stops the device itself before re-arming
+        self._pending_ops.append(op)
+        self._abort = True
+        self._ready_evt.set()
+
+    def _recompute_scales(self) -> None:
+        # Volts per ADC count; only changes with the channel ranges or max ADC value
+        max_adc = float(self.max_adc.value if self.max_adc.value != 0 else 32767)
+        self._scale_a = np.float32(RANGE_VOLTS_BY_CODE[self.cfg.range_a] / max_adc)
+        self._scale_b = np.float32(RANGE_VOLTS_BY_CODE[self.cfg.range_b] / max_adc)
+        # Column vector so both channel rows scale in a single broadcast multiply
+        self._scales = np.array([[self._scale_a], [self._scale_b]], dtype=np.float32)
 
     def start(self) -> None:
         if self._running:
             return
         self._running = True
+        self._stop_evt.clear()
+        stop_evt = self._stop_evt
+        self._last_segment = c_uint32(self._captures - 1)
+        self._overflow_bulk = (c_int16 * self._captures)()
 
         def _loop():
-            while self._running:
+            while not stop_evt.is_set() and self._do_one_capture():
+                # Pace captures roughly to UI refresh; returns early when stop() is called
+                stop_evt.wait(max(0.0, self.cfg.plot_refresh_ms/1000.0 - 0.001))
+
+        self._thread = threading.Thread(target=_loop, daemon=True)
+        self._thread.start()
+
+    def _do_one_capture(self) -> bool:
+        """Acquire and publish one rapid block. Returns False when the loop must exit."""
+        try:
+            slots, cnt = self._acquire_block()
+        except (OSError, PicoSDKError):
+            # SDK failure (already logged by _check_status): back off briefly, then retry
+            self._stop_evt.wait(0.01)
+            return True
+        if slots is None:
+            return not self._stop_evt.is_set()
+        if cnt <= 0:
+            return True
+        scales = self._scales
+        # Readers don't lock; the lock only orders publishing against _alloc_slots()
+        with self._lock:
+            for slot in slots:
+                self._slot_counts[slot] = cnt
+                # Slots keep the scales they were captured with, so set_range() never
+                # rescales an already-published frame
+                self._slot_scales[slot] = scales
+            # Single int store under the GIL: counts are visible before the new generation
+            self._head += len(slots)
+            self._published += len(slots)
+        self._prepare_display(slots[-1], cnt, scales)
+        return True
+
+    def _acquire_block(self) -> tuple[list[int] | None, int]:
+        # SDK-only part of a capture: returns the filled slots and sample count,
+        # or (None, 0) when stopped or after a fatal RunBlock failure
+        verbose = _PICO_VERBOSE
+        handle = self.handle
+        n_samples = self._n_samples
+        ratio_none = self._c_ratio_none
+        zero_u32 = self._c_zero_u32
+        captures = self._captures
+        with self._sdk_lock:
+            # _abort is reset before the event is cleared: a _submit() landing in between then
+            # leaves _abort set, so the block below is discarded rather than read un-triggered
+            self._abort = False
+            self._ready_evt.clear()
+            # Settings submitted while running (set_range/apply_trigger) go in before the next block
+            pending = self._pending_ops
+            while pending:
                 try:
-                    # Prepare buffers for this capture
-                    st = self.ps.ps5000aSetDataBuffer(self.handle, PS5000A_CHANNEL_A, self._buf_a, self._n_samples, 0, PS5000A_RATIO_MODE_NONE)
+                    pending.popleft()()
+                except PicoSDKError as e:
+                    # Nobody on this thread to tell; the GUI picks it up from `error`
+                    self.error = e
+            # Prepare buffers for this block: segment i fills the i-th next unpublished slot
+            first = self._head
+            mask = self._slot_mask
+            slots = [(first + i) & mask for i in range(captures)]
+            set_data_buffer = self._SetDataBufferFn
+            for seg, slot in enumerate(slots):
+                buf_a, buf_b = self._slots[slot][:2]
+                st = set_data_buffer(handle, PS5000A_CHANNEL_A, buf_a, n_samples, seg, ratio_none)
+                if st or verbose:
                     _check_status(st, "ps5000aSetDataBuffer(A)")
-                    st = self.ps.ps5000aSetDataBuffer(self.handle, PS5000A_CHANNEL_B, self._buf_b, self._n_samples, 0, PS5000A_RATIO_MODE_NONE)
+                st = set_data_buffer(handle, PS5000A_CHANNEL_B, buf_b, n_samples, seg, ratio_none)
+                if st or verbose:
                     _check_status(st, "ps5000aSetDataBuffer(B)")
-                    # Run block capture: pre=0, post=n
-                    time_indisposed = c_int32(0)
-                    st = self.ps.ps5000aRunBlock(self.handle, c_int32(0), c_int32(self._n_samples), self._timebase, byref(time_indisposed), c_uint32(0), None, None)
-                    if int(st) != PICO_OK:
-                        # Fatal: don't retry; break loop and close device
-                        try:
-                            msg = _status_text(int(st))
-                        except Exception:
-                            msg = str(int(st))
-                        print(f"[PicoSDK][ERROR] ps5000aRunBlock failed: {msg}")
-                        self._running = False
-                        # Close device from thread without joining self
-                        try:
-                            self.ps.ps5000aCloseUnit(self.handle)
-                        except Exception:
-                            pass
-                        break
-                    # Poll readiness
-                    ready = c_int16(0)
-                    while self._running and int(ready.value) == 0:
-                        self.ps.ps5000aIsReady(self.handle, byref(ready))
-                        # Avoid busy spin
-                        time.sleep(0.001)
-                    if not self._running:
-                        break
-                    # Retrieve data
-                    n_samps = c_uint32(self._n_samples)
-                    overflow = c_int16(0)
-                    st = self.ps.ps5000aGetValues(self.handle, c_uint32(0), byref(n_samps), c_uint32(1), c_int32(0), c_uint32(0), byref(overflow))
-                    _check_status(st, "ps5000aGetValues")
-
-                    cnt = int(n_samps.value)
-                    if cnt <= 0:
-                        continue
-                    max_adc = float(self.max_adc.value if self.max_adc.value != 0 else 32767)
-                    scale_a = RANGE_TO_VOLTS.get(self.cfg.range_a, 2.0) / max_adc
-                    scale_b = RANGE_TO_VOLTS.get(self.cfg.range_b, 2.0) / max_adc
-                    with self._lock:
-                        a = np.frombuffer(self._buf_a, dtype=np.int16, count=cnt, offset=0) * scale_a
-                        b = np.frombuffer(self._buf_b, dtype=np.int16, count=cnt, offset=0) * scale_b
-                        # Resize time axis if needed
-                        if cnt != len(self._t):
-                            self._t = np.linspace(0.0, self._window_s - self._dt_s, cnt, dtype=np.float64)
-                        self._y_a = a.astype(np.float32, copy=True)
-                        self._y_b = b.astype(np.float32, copy=True)
+            # Run block capture: pre=0, post=n (x captures)
+            st = self._RunBlockFn(handle, self._c_zero_i32, n_samples, self._timebase, self._ref_time_indisposed, zero_u32, self._ready_cb, None)
+            if int(st) != PICO_OK:
+                # Fatal: don't retry; stop loop and close device
+                try:
+                    msg = _status_text(int(st))
+                except Exception:
+                    msg = str(int(st))
+                print(f"[PicoSDK][ERROR] ps5000aRunBlock failed: {msg}")
+                self._running = False
+                self._stop_evt.set()
+                # Close device from thread without joining self
+                try:
+                    self.ps.ps5000aCloseUnit(handle)
                 except Exception:
-                    # Keep loop alive; next iteration will retry
                     pass
-                # Pace captures roughly to UI refresh; autotrigger also enforces cadence
-                time.sleep(max(0.0, self.cfg.plot_refresh_ms/1000.0 - 0.001))
-
-        self._thread = threading.Thread(target=_loop, daemon=True)
-        self._thread.start()
+                return None, 0
+        # Wait for the block-ready callback (stop() also sets the event)
+        self._ready_evt.wait()
+        with self._sdk_lock:
+            if self._stop_evt.is_set() or self._abort:
+                # Stopped, or cancelled by _submit(): make sure the device is idle before
+                # re-arming (stop() may have called ps5000aStop before this block was run)
+                self.ps.ps5000aStop(handle)
+                return None, 0
+            if self._ready_status or verbose:
+                _check_status(self._ready_status, "ps5000aBlockReady")
+            # Retrieve data
+            n_samps = self._c_n_samps
+            n_samps.value = n_samples
+            if captures == 1:
+                self._c_overflow.value = 0
+                st = self._GetValuesFn(handle, zero_u32, self._ref_n_samps, self._c_one_u32, ratio_none, zero_u32, self._ref_overflow)
+                if st or verbose:
+                    _check_status(st, "ps5000aGetValues")
+            else:
+                # All segments in one round-trip
+                st = self._GetValuesBulkFn(handle, self._ref_n_samps, zero_u32, self._last_segment, self._c_one_u32, ratio_none, self._overflow_bulk)
+                if st or verbose:
+                    _check_status(st, "ps5000aGetValuesBulk")
+            return slots, int(n_samps.value)
 
     def stop(self) -> None:
         if not self._running:
             return
         self._running = False
-        try:
-            # No explicit stop for block; ensure thread stops
-            pass
-        except Exception:
-            pass
+        self._stop_evt.set()
+        # Cancel a block still waiting on its trigger, so its callback cannot fire into the
+        # next start(); the lock keeps this off the SDK calls the capture thread is making
+        with self._sdk_lock:
+            self.ps.ps5000aStop(self.handle)
+        self._ready_evt.set()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=0.5)
         self._thread = None
@@ -342,11 +669,7 @@ class PicoScopeRapidBlock:
         if max_allowed is not None and self._n_samples > max_allowed:
             self._n_samples = max_allowed
         with self._lock:
-            self._buf_a = (c_int16 * self._n_samples)()
-            self._buf_b = (c_int16 * self._n_samples)()
-            self._y_a = np.zeros(self._n_samples, dtype=np.float32)
-            self._y_b = np.zeros(self._n_samples, dtype=np.float32)
-            self._t = np.linspace(0.0, self._window_s - self._dt_s, self._n_samples, dtype=np.float64)
+            self._alloc_slots()
         # Recompute timebase for new dt
         self._timebase = c_uint32(self._find_timebase(self._n_samples))
         return int(self.cfg.sample_interval_ns)
@@ -360,11 +683,7 @@ class PicoScopeRapidBlock:
         if max_allowed is not None and self._n_samples > max_allowed:
             self._n_samples = max_allowed
         with self._lock:
-            self._buf_a = (c_int16 * self._n_samples)()
-            self._buf_b = (c_int16 * self._n_samples)()
-            self._y_a = np.zeros(self._n_samples, dtype=np.float32)
-            self._y_b = np.zeros(self._n_samples, dtype=np.float32)
-            self._t = np.linspace(0.0, self._window_s - self._dt_s, self._n_samples, dtype=np.float64)
+            self._alloc_slots()
         # Update timebase samples depth
         self._timebase = c_uint32(self._find_timebase(self._n_samples))
         return float(self.cfg.plot_window_ms)
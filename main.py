@@ -5,25 +5,54 @@ PicoScope 5000B rapid block viewer for Channels A and B.
 """
 from __future__ import annotations
 
+import bisect
 import sys
+from types import MappingProxyType
 import numpy as np
 
 from PyQt5 import QtCore, QtWidgets, QtGui
 import os
+import time
 import datetime
-from plotter import PlotterWidget
+# Prefer the pyqtgraph plot widget when installed; PICO_PLOTTER=matplotlib forces the original one
+if os.environ.get("PICO_PLOTTER", "").strip().lower() in ("matplotlib", "mpl"):
+    from plotter import PlotterWidget
+else:
+    try:
+        from plotter_pg import PlotterWidget
+    except ImportError:
+        from plotter import PlotterWidget
 from picoscope_constants import (
     RANGE_CODES,
     RANGE_LABELS,
     RANGE_TO_VOLTS,
+    RANGE_VOLTS_BY_CODE,
+    PS5000A_2V,
     PS5000A_CHANNEL_A,
     PS5000A_CHANNEL_B,
 )
+from bin_writer import SESSION_HEADER, SessionBinWriter
 from driver import (
     BlockConfig as DriverBlockConfig,
     PicoScopeRapidBlock as DriverPicoScopeRapidBlock,
 )
 
+# Rate combo entries -> requested sample interval (ns), in display order
+_RATE_MAP = MappingProxyType({
+    "100 ns": 100,
+    "200 ns": 200,
+    "500 ns": 500,
+    "1 us": 1000,
+    "2 us": 2000,
+    "5 us": 5000,
+})
+# Timebase +/- window steps (s); sorted, as the step handlers bisect it
+_TIMEBASE_STEPS_S = (
+    10e-6, 20e-6, 50e-6,
+    100e-6, 200e-6, 500e-6,
+    1e-3, 2e-3, 5e-3, 10e-3,
+)
+
 
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self):
@@ -32,15 +61,8 @@ class MainWindow(QtWidgets.QMainWindow):
 
         self.cfg = DriverBlockConfig()
         # Default ranges to 2V like streaming app
-        try:
-            # crude: find label '2 V'
-            for code, label in RANGE_LABELS.items():
-                if label == '±2 V' or label.endswith('2 V'):
-                    self.cfg.range_a = code
-                    self.cfg.range_b = code
-                    break
-        except Exception:
-            pass
+        self.cfg.range_a = PS5000A_2V
+        self.cfg.range_b = PS5000A_2V
 
         central = QtWidgets.QWidget()
         vbox = QtWidgets.QVBoxLayout(central)
@@ -51,40 +73,43 @@ class MainWindow(QtWidgets.QMainWindow):
         hbox.addWidget(self.status_lbl)
 
         hbox.addSpacing(20)
+        # Both range combos share one label list; item data carries the range code
+        range_labels = [RANGE_LABELS[code] for code in RANGE_CODES]
         self.a_range_lbl = QtWidgets.QLabel(f"A Range: {RANGE_LABELS.get(self.cfg.range_a, '')}")
         self.a_range_combo = QtWidgets.QComboBox()
-        for code in RANGE_CODES:
-            self.a_range_combo.addItem(RANGE_LABELS[code], userData=code)
+        self.a_range_combo.addItems(range_labels)
+        for i, code in enumerate(RANGE_CODES):
+            self.a_range_combo.setItemData(i, code)
         # Set combo to current config
         try:
             a_idx = RANGE_CODES.index(self.cfg.range_a)
             self.a_range_combo.setCurrentIndex(a_idx)
         except Exception:
             pass
-        self.a_range_combo.currentIndexChanged.connect(self._on_a_range_changed)
+        # activated fires only on user selection, not while scrolling or on programmatic changes
+        self.a_range_combo.activated.connect(self._on_a_range_changed)
         hbox.addWidget(self.a_range_lbl)
         hbox.addWidget(self.a_range_combo)
 
         hbox.addSpacing(10)
         self.b_range_lbl = QtWidgets.QLabel(f"B Range: {RANGE_LABELS.get(self.cfg.range_b, '')}")
         self.b_range_combo = QtWidgets.QComboBox()
-        for code in RANGE_CODES:
-            self.b_range_combo.addItem(RANGE_LABELS[code], userData=code)
+        self.b_range_combo.addItems(range_labels)
+        for i, code in enumerate(RANGE_CODES):
+            self.b_range_combo.setItemData(i, code)
         try:
             b_idx = RANGE_CODES.index(self.cfg.range_b)
             self.b_range_combo.setCurrentIndex(b_idx)
         except Exception:
             pass
-        self.b_range_combo.currentIndexChanged.connect(self._on_b_range_changed)
+        self.b_range_combo.activated.connect(self._on_b_range_changed)
         hbox.addWidget(self.b_range_lbl)
         hbox.addWidget(self.b_range_combo)
 
         hbox.addSpacing(20)
         self.rate_lbl = QtWidgets.QLabel("Rate:")
         self.rate_combo = QtWidgets.QComboBox()
-        self.rate_combo.addItems([
-            "100 ns", "200 ns", "500 ns", "1 us", "2 us", "5 us"
-        ])
+        self.rate_combo.addItems(list(_RATE_MAP))
         self.rate_combo.setCurrentIndex(0)  # 100 ns default
         self.apply_rate_btn = QtWidgets.QPushButton("Apply Rate")
         self.apply_rate_btn.clicked.connect(self._apply_rate)
@@ -92,11 +117,30 @@ class MainWindow(QtWidgets.QMainWindow):
         hbox.addWidget(self.rate_combo)
         hbox.addWidget(self.apply_rate_btn)
 
+        # Redraw cap, independent of the capture/refresh timer
+        hbox.addSpacing(10)
+        hbox.addWidget(QtWidgets.QLabel("Max FPS:"))
+        self.fps_spin = QtWidgets.QSpinBox()
+        self.fps_spin.setRange(1, 60)
+        self.fps_spin.setValue(15)
+        self.fps_spin.valueChanged.connect(self._on_max_fps_changed)
+        hbox.addWidget(self.fps_spin)
+        self._min_redraw_dt = 1.0 / float(self.fps_spin.value())
+        self._last_draw = 0.0
+
         # Trigger: level control only (no autotrigger, always armed)
         # Default trigger level to 0 V
         hbox.addSpacing(20)
         init_rng = self.cfg.range_a if self.cfg.trigger_source == PS5000A_CHANNEL_A else self.cfg.range_b
         self._trigger_level_v = 0.0
+        # Trigger nudges move the indicator at once; the hardware is re-armed 150 ms after
+        # the last one, and only if (enabled, threshold) differs from what was last applied
+        self._trigger_last: tuple[bool, float] | None = None
+        self._pending_trigger_pct = 0.0
+        self._trig_debounce = QtCore.QTimer(self)
+        self._trig_debounce.setSingleShot(True)
+        self._trig_debounce.setInterval(150)
+        self._trig_debounce.timeout.connect(self._commit_trigger)
 
         # Timebase +/- buttons (discrete window sizes)
         hbox.addSpacing(20)
@@ -123,6 +167,14 @@ class MainWindow(QtWidgets.QMainWindow):
         self.window_spin.setValue(float(self.cfg.plot_window_ms))
         self.window_spin.valueChanged.connect(self._on_window_changed)
         hbox.addWidget(self.window_spin)
+        # Window edits apply 150 ms after the last change, not on every keystroke/arrow tick
+        self._pending_window_ms = float(self.cfg.plot_window_ms)
+        self._win_debounce = QtCore.QTimer(self)
+        self._win_debounce.setSingleShot(True)
+        self._win_debounce.setInterval(150)
+        self._win_debounce.timeout.connect(self._apply_pending_window)
+        # Enter / focus-out commits right away instead of waiting out the debounce
+        self.window_spin.editingFinished.connect(self._apply_pending_window)
 
         # Cursor controls (2 vertical + 2 horizontal) and UI
         hbox.addSpacing(20)
@@ -219,6 +271,9 @@ class MainWindow(QtWidgets.QMainWindow):
         self.rec_overlay_lbl.setVisible(False)
 
         self.block: DriverPicoScopeRapidBlock | None = None
+        # Read by _refresh_cursor_readouts(), which startup already reaches via
+        # _apply_time_axis_format()
+        self._cursor_readout_key: tuple | None = None
 
         try:
             self.block = DriverPicoScopeRapidBlock(self.cfg)
@@ -233,10 +288,9 @@ class MainWindow(QtWidgets.QMainWindow):
             self.plotter.set_trigger_level_norm(norm_y)
             # Apply trigger to hardware (enabled, no autotrigger) at 0 V
             try:
-                self.block.stop()
                 threshold_pct = (self._trigger_level_v / fs_v) if fs_v else 0.0
                 self.block.apply_trigger(True, threshold_pct)
-                self.block.start()
+                self._trigger_last = (True, threshold_pct)
                 self.status_lbl.setText(f"Status: Rapid Block @ {actual_ns} ns — Trigger ON @ {self._trigger_level_v:.3f} V")
             except Exception:
                 pass
@@ -245,10 +299,16 @@ class MainWindow(QtWidgets.QMainWindow):
             self.block = None
             self.status_lbl.setText(f"Status: Error — {e}")
 
+        self._update_norm_scales()
+        self._last_published = -1
+        # Single-shot, re-armed after each frame so a slow redraw delays the next one
+        # instead of letting timeouts pile up in the event loop
         self.timer = QtCore.QTimer(self)
-        self.timer.setInterval(self.cfg.plot_refresh_ms)
-        self.timer.timeout.connect(self.update_plot)
-        self.timer.start()
+        self.timer.setSingleShot(True)
+        # Default CoarseTimer may fire up to 5% late on Windows; frames should keep their cadence
+        self.timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.timer.timeout.connect(self._on_frame_timer)
+        self.timer.start(self.cfg.plot_refresh_ms)
 
         self.resize(900, 500)
         # Keyboard shortcuts for cursor movement
@@ -262,92 +322,135 @@ class MainWindow(QtWidgets.QMainWindow):
         self._short_down.activated.connect(lambda: self._on_key_move('h', -1))
         # Base rate tracking & timebase steps
         self._rate_base_ns: int = int(self.cfg.sample_interval_ns)
-        self._timebase_steps_s = [
-            10e-6, 20e-6, 50e-6,
-            100e-6, 200e-6, 500e-6,
-            1e-3, 2e-3, 5e-3, 10e-3,
-        ]
+        self._timebase_steps_s = _TIMEBASE_STEPS_S
         self._refresh_cursor_readouts()
         # Recording state
         self._rec_dir: str | None = None
         self._rec_on: bool = False
         self._rec_count: int = 0
+        # Captures lost to the slot ring (GUI ticks too far apart); the writer counts its own drops
+        self._rec_skipped: int = 0
         self._rec_started_at: datetime.datetime | None = None
         self._rec_meta: dict[str, object] = {}
+        self._rec_writer: SessionBinWriter | None = None
+        # Normalized display frame, rewritten in place every redraw
+        self._disp_norm = np.empty((2, self.cfg.plot_max_points), dtype=np.float32)
+
+    def _on_max_fps_changed(self, value: int) -> None:
+        self._min_redraw_dt = 1.0 / float(max(1, value))
+
+    def _on_frame_timer(self) -> None:
+        t0 = time.perf_counter()
+        try:
+            self.update_plot()
+        finally:
+            elapsed_ms = (time.perf_counter() - t0) * 1e3
+            self.timer.start(max(int(self.cfg.plot_refresh_ms), int(elapsed_ms * 1.2)))
 
     def update_plot(self) -> None:
-        if self.block and self.block._running:
-            with self.block._lock:
-                ya = self.block._y_a.copy()
-                yb = self.block._y_b.copy()
-                tt = self.block._t.copy()
-            if not self._rec_on:
-                # Normal UI refresh when not recording
-                fs_a = RANGE_TO_VOLTS.get(self.block.cfg.range_a, 1.0)
-                fs_b = RANGE_TO_VOLTS.get(self.block.cfg.range_b, 1.0)
-                ya_n = ya / fs_a if fs_a else ya
-                yb_n = yb / fs_b if fs_b else yb
-                self.plotter.update_series(tt, ya_n, yb_n, self.cfg.plot_max_points)
-                self._refresh_cursor_readouts()
-                # Hide any overlay if previously shown
-                if self.rec_overlay_lbl.isVisible():
-                    self.rec_overlay_lbl.setVisible(False)
-            else:
-                # Recording mode: do not refresh plot, show overlay message
-                self.rec_overlay_lbl.setGeometry(self.plotter.canvas.rect())
-                if not self.rec_overlay_lbl.isVisible():
-                    self.rec_overlay_lbl.setVisible(True)
-            # Save current acquisition to disk if recording is active
-            try:
-                if self._rec_on and self._rec_dir and len(ya) and len(yb):
+        if not (self.block and self.block._running):
+            return
+        error = self.block.error
+        if error is not None:
+            # A range/trigger change the capture thread could not apply
+            self.block.error = None
+            self.status_lbl.setText(f"Status: Setting change failed — {error}")
+            # It may have been the trigger; forget it so the same level can be retried
+            self._trigger_last = None
+        if error is not None or (self.cfg.range_a, self.cfg.range_b) != self._norm_ranges:
+            # A range change was applied (or refused) on the capture thread
+            self._sync_ranges_from_cfg()
+        # Nobody sees a redraw while minimized/hidden; recording still needs every capture
+        if not self._rec_on and (self.isMinimized() or not self.isVisible()):
+            return
+        # Nothing new since the last frame (slow trigger/rate): skip the read, draw and save
+        published = self.block.captures_published
+        if published == self._last_published:
+            return
+        if not self._rec_on:
+            # Throttle redraws to the Max FPS cap; the capture stays unread for next tick
+            now = time.monotonic()
+            if now - self._last_draw < self._min_redraw_dt:
+                return
+            self._last_draw = now
+        seen, self._last_published = self._last_published, published
+        if not self._rec_on:
+            # Normal UI refresh when not recording; the capture thread has already
+            # decimated the newest capture; reading it out also normalizes to full scale
+            tt, ya, yb = self.block.latest_display(self._norm_gains, out=self._disp_norm)
+            self.plotter.update_series(tt, ya, yb, self.cfg.plot_max_points)
+            self._refresh_cursor_readouts()
+            # Hide any overlay if previously shown
+            if self.rec_overlay_lbl.isVisible():
+                self.rec_overlay_lbl.setVisible(False)
+            return
+        # Recording mode: every capture published since the last tick goes to disk as
+        # raw ADC counts plus scale, not just the newest one; no plot refresh
+        self._last_published, frames, skipped = self.block.captures_since(seen, raw=True)
+        # Overwritten in the slot ring before this tick could read them
+        self._rec_skipped += skipped
+        # Show overlay message
+        self.rec_overlay_lbl.setGeometry(self.plotter.canvas.rect())
+        if not self.rec_overlay_lbl.isVisible():
+            self.rec_overlay_lbl.setVisible(True)
+        # Queue the new acquisitions for the background writer
+        if self._rec_writer is None:
+            return
+        for counts_ab, scales in frames:
+            if counts_ab.shape[1]:
+                # Dropped (writer backlog full) captures are counted by the writer
+                if self._rec_writer.submit(self._rec_count, counts_ab, scales):
                     self._rec_count += 1
-                    fname = f"acq_{self._rec_count:03d}.bin"
-                    fpath = QtCore.QDir(self._rec_dir).filePath(fname)
-                    # Write A then B as float16 raw binary
-                    with open(fpath, "wb") as f:
-                        ya.astype(np.float16, copy=False).tofile(f)
-                        yb.astype(np.float16, copy=False).tofile(f)
-            except Exception as e:
-                # Non-fatal: update status and keep UI responsive
-                self.status_lbl.setText(f"Status: Save failed — {e}")
+        if self._rec_writer.error is not None:
+            # Non-fatal: update status and keep UI responsive
+            self.status_lbl.setText(f"Status: Save failed — {self._rec_writer.error}")
+            self._rec_writer.error = None
 
     def _on_a_range_changed(self, idx: int) -> None:
         code = self.a_range_combo.itemData(idx)
-        if code is None or self.block is None:
+        if code is None or self.block is None or int(code) == self.block.cfg.range_a:
             return
         try:
-            self.block.stop()
+            # Applied by the capture thread between blocks; no restart needed. cfg only
+            # changes once the hardware has taken it, and update_plot() follows cfg
             self.block.set_range(PS5000A_CHANNEL_A, int(code))
-            self.block.start()
-            self.a_range_lbl.setText(f"A Range: {RANGE_LABELS[int(code)]}")
         except Exception as e:
             self.status_lbl.setText(f"Status: Range change failed — {e}")
+        self._sync_ranges_from_cfg(keep_combos=not self.block._running)
 
     def _on_b_range_changed(self, idx: int) -> None:
         code = self.b_range_combo.itemData(idx)
-        if code is None or self.block is None:
+        if code is None or self.block is None or int(code) == self.block.cfg.range_b:
             return
         try:
-            self.block.stop()
             self.block.set_range(PS5000A_CHANNEL_B, int(code))
-            self.block.start()
-            self.b_range_lbl.setText(f"B Range: {RANGE_LABELS[int(code)]}")
         except Exception as e:
             self.status_lbl.setText(f"Status: Range change failed — {e}")
+        self._sync_ranges_from_cfg(keep_combos=not self.block._running)
+
+    def _update_norm_scales(self) -> None:
+        # Cached 1 / full-scale volts per channel as a (2, 1) column; only changes with the ranges
+        self._norm_ranges = (self.cfg.range_a, self.cfg.range_b)
+        self._norm_gains = np.array([[1.0 / RANGE_VOLTS_BY_CODE[self.cfg.range_a]],
+                                     [1.0 / RANGE_VOLTS_BY_CODE[self.cfg.range_b]]], dtype=np.float32)
+
+    def _sync_ranges_from_cfg(self, keep_combos: bool = False) -> None:
+        # Labels and normalization follow the ranges the hardware is actually on; the
+        # combos too, unless a change picked in them may still be waiting to be applied
+        for combo, lbl, name, code in ((self.a_range_combo, self.a_range_lbl, "A", self.cfg.range_a),
+                                       (self.b_range_combo, self.b_range_lbl, "B", self.cfg.range_b)):
+            if not keep_combos:
+                idx = combo.findData(code)
+                if idx >= 0:
+                    combo.setCurrentIndex(idx)
+            lbl.setText(f"{name} Range: {RANGE_LABELS.get(code, '')}")
+        self._update_norm_scales()
 
     def _apply_rate(self) -> None:
         if not self.block:
             return
         text = self.rate_combo.currentText()
-        mapping = {
-            "100 ns": 100,
-            "200 ns": 200,
-            "500 ns": 500,
-            "1 us": 1000,
-            "2 us": 2000,
-            "5 us": 5000,
-        }
-        target_ns = mapping.get(text, 100)
+        target_ns = _RATE_MAP.get(text, 100)
         try:
             self.block.stop()
             actual_ns = int(self.block.reconfigure_timebase(target_ns))
@@ -358,11 +461,20 @@ class MainWindow(QtWidgets.QMainWindow):
             self.status_lbl.setText(f"Status: Rate apply failed — {e}")
 
     def _on_window_changed(self, value: float) -> None:
-        if not self.block:
+        self._pending_window_ms = float(value)
+        self._win_debounce.start()
+
+    def _apply_pending_window(self) -> None:
+        self._win_debounce.stop()
+        # The spin box is the source of truth: the +/- buttons update it with signals
+        # blocked, so a value typed (or debounced) before them would be stale
+        self._pending_window_ms = float(self.window_spin.value())
+        # Edits that end on the active window (e.g. up then down) need no reconfigure
+        if not self.block or self._pending_window_ms == self.block.cfg.plot_window_ms:
             return
         try:
             self.block.stop()
-            actual_ms = float(self.block.reconfigure_window_ms(float(value)))
+            actual_ms = float(self.block.reconfigure_window_ms(self._pending_window_ms))
             self.block.start()
             self._apply_time_axis_format(actual_ms * 1e-3)
             self.status_lbl.setText(f"Status: Window {actual_ms:.3f} ms")
@@ -376,32 +488,24 @@ class MainWindow(QtWidgets.QMainWindow):
         self._refresh_cursor_readouts()
 
     def _on_timebase_inc(self) -> None:
-        # Increase window to next larger step
-        cur_ms = float(self.cfg.plot_window_ms)
-        cur_s = cur_ms * 1e-3
+        # Increase window to next larger step (steps are sorted)
+        cur_s = float(self.cfg.plot_window_ms) * 1e-3
         steps = self._timebase_steps_s
-        for s in steps:
-            if s > cur_s:
-                self._set_window_ms(s * 1e3)
-                return
-        self._set_window_ms(steps[-1] * 1e3)
+        i = bisect.bisect_right(steps, cur_s)
+        self._set_window_ms(steps[min(i, len(steps) - 1)] * 1e3)
 
     def _on_timebase_dec(self) -> None:
         # Decrease window to next smaller step
-        cur_ms = float(self.cfg.plot_window_ms)
-        cur_s = cur_ms * 1e-3
+        cur_s = float(self.cfg.plot_window_ms) * 1e-3
         steps = self._timebase_steps_s
-        prev = steps[0]
-        for s in steps:
-            if s >= cur_s:
-                self._set_window_ms(prev * 1e3)
-                return
-            prev = s
-        self._set_window_ms(steps[0] * 1e3)
+        i = bisect.bisect_left(steps, cur_s)
+        self._set_window_ms(steps[max(i - 1, 0)] * 1e3)
 
     def _set_window_ms(self, window_ms: float) -> None:
         if not self.block:
             return
+        # Supersedes any typed edit still waiting on the debounce
+        self._win_debounce.stop()
         try:
             self.block.stop()
             actual_ms = float(self.block.reconfigure_window_ms(float(window_ms)))
@@ -409,6 +513,7 @@ class MainWindow(QtWidgets.QMainWindow):
             self.window_spin.blockSignals(True)
             self.window_spin.setValue(actual_ms)
             self.window_spin.blockSignals(False)
+            self._pending_window_ms = actual_ms
             self.block.start()
             self._apply_time_axis_format(actual_ms * 1e-3)
             self.status_lbl.setText(f"Status: Window {actual_ms:.3f} ms")
@@ -433,9 +538,15 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _refresh_cursor_readouts(self) -> None:
         try:
-            x1, x2, y1, y2, dx, dy = self.plotter.get_cursor_values()
+            vals = self.plotter.get_cursor_values()
         except Exception:
             return
+        # Called every frame; labels only change when a cursor moves or the time unit flips
+        key = (vals, self.cfg.plot_window_ms < 1.0)
+        if key == self._cursor_readout_key:
+            return
+        self._cursor_readout_key = key
+        x1, x2, y1, y2, dx, dy = vals
         self.lbl_v1.setText(f"X1: {self._format_time(x1)}")
         self.lbl_v2.setText(f"X2: {self._format_time(x2)}")
         self.lbl_dx.setText(f"Δx: {self._format_time(dx)}")
@@ -472,18 +583,25 @@ class MainWindow(QtWidgets.QMainWindow):
             self._trigger_level_v = float(level_v)
             self._refresh_trigger_readout()
             if self.block:
-                was_running = self.block._running
-                if was_running:
-                    self.block.stop()
-                threshold_pct = (level_v / fs_v) if fs_v else 0.0
-                self.block.apply_trigger(True, threshold_pct)
-                if was_running:
-                    self.block.start()
+                self._pending_trigger_pct = (level_v / fs_v) if fs_v else 0.0
+                self._trig_debounce.start()
             else:
                 self.cfg.trigger_threshold_pct = (level_v / fs_v) if fs_v else 0.0
         except Exception as e:
             self.status_lbl.setText(f"Status: Trigger move failed — {e}")
 
+    def _commit_trigger(self) -> None:
+        key = (True, self._pending_trigger_pct)
+        if not self.block or key == self._trigger_last:
+            return
+        try:
+            # While capturing this only queues the change; update_plot() clears
+            # _trigger_last again if the capture thread reports it refused
+            self.block.apply_trigger(*key)
+            self._trigger_last = key
+        except Exception as e:
+            self.status_lbl.setText(f"Status: Trigger move failed — {e}")
+
     def _refresh_trigger_readout(self) -> None:
         try:
             self.lbl_trig.setText(f"{self._trigger_level_v:+.3f} V")
@@ -492,6 +610,7 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def closeEvent(self, a0) -> None:
         try:
+            self._close_rec_writer()
             if self.block:
                 self.block.close()
         finally:
@@ -511,8 +630,13 @@ class MainWindow(QtWidgets.QMainWindow):
             self._on_choose_rec_folder()
             if not self._rec_dir:
                 return
+        self._rec_writer = SessionBinWriter(self._rec_dir)
         self._rec_on = True
         self._rec_count = 0
+        self._rec_skipped = 0
+        # Save only captures published from here on
+        if self.block:
+            self._last_published = self.block.captures_published
         # Capture start time and session metadata
         self._rec_started_at = datetime.datetime.now()
         # Sampling frequency (Hz)
@@ -536,6 +660,10 @@ class MainWindow(QtWidgets.QMainWindow):
 
     def _on_stop_rec(self) -> None:
         self._rec_on = False
+        writer = self._rec_writer
+        self._close_rec_writer()
+        files = writer.files if writer else []
+        dropped = (writer.dropped if writer else 0) + self._rec_skipped
         self.rec_start_btn.setEnabled(True)
         self.rec_stop_btn.setEnabled(False)
         self.rec_folder_btn.setEnabled(True)
@@ -551,12 +679,22 @@ class MainWindow(QtWidgets.QMainWindow):
                 lines.append(f"sampling_frequency_hz: {samp_hz:.6f}\n")
                 lines.append(f"frame_rate_hz: {frame_hz:.3f}\n")
                 lines.append(f"acquisitions_saved: {self._rec_count}\n")
+                lines.append(f"acquisitions_dropped: {dropped}\n")
+                lines.append(f"session_files: {', '.join(files)}\n")
+                lines.append(f"record_header: struct '{SESSION_HEADER.format}' (index, timestamp_ns, n_samples, volts_per_count_a, volts_per_count_b)\n")
+                lines.append("sample_format: int16 ADC counts, A then B; volts = counts * volts_per_count\n")
                 with open(meta_path, "w", encoding="utf-8") as mf:
                     mf.writelines(lines)
         except Exception as e:
             self.status_lbl.setText(f"Status: Metadata write failed — {e}")
         self.status_lbl.setText("Status: Recording stopped")
 
+    def _close_rec_writer(self) -> None:
+        # Flushes queued acquisitions; metadata is only written once they are on disk
+        if self._rec_writer is not None:
+            self._rec_writer.close()
+            self._rec_writer = None
+
 
 def picoscope_5000_block() -> int:
     app = QtWidgets.QApplication(sys.argv)
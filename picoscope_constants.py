@@ -57,6 +57,9 @@ RANGE_CODES = [
     PS5000A_20V,
 ]
 
+# Full-scale volts indexed directly by range code (codes are dense 0..10)
+RANGE_VOLTS_BY_CODE: tuple[float, ...] = tuple(RANGE_TO_VOLTS[c] for c in RANGE_CODES)
+
 RANGE_LABELS = {
     PS5000A_10MV: "10 mV",
     PS5000A_20MV: "20 mV",
@@ -123,15 +126,12 @@ def load_status_texts_from_file() -> None:
             return
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
-        for k, v in data.items():
-            try:
-                if isinstance(k, str) and k.lower().startswith("0x"):
-                    ik = int(k, 16)
-                else:
-                    ik = int(k)
-                STATUS_TEXT[ik] = str(v)
-            except Exception:
-                continue
+        # JSON keys are always str; parse them all in one pass and merge at once so a
+        # malformed file leaves STATUS_TEXT untouched rather than half-updated
+        STATUS_TEXT.update({
+            int(k, 16) if k[:2].lower() == "0x" else int(k): str(v)
+            for k, v in data.items() if k
+        })
     except Exception:
         # Non-fatal: keep built-in minimal map
         pass
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+
+
+def decimate_dual(x: np.ndarray, y1: np.ndarray, y2: np.ndarray,
+                  max_points: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Reduce two traces sharing the axis x to at most max_points points each.
+
+    Shared by both plot widgets. Inputs that already fit are returned unchanged.
+    """
+    n = len(x)
+    if n <= max_points:
+        return x, y1, y2
+    # Min/max envelope: two points per bucket, both at the bucket centre, so peaks
+    # between kept samples are not lost; bucketing and x are shared by both channels
+    stride = -(-n // max(1, max_points // 2))
+    m = n // stride
+    y_d = np.empty((2, m, 2), dtype=np.result_type(y1, y2))
+    for y, out in ((y1, y_d[0]), (y2, y_d[1])):
+        blocks = y[:m * stride].reshape(m, stride)
+        np.min(blocks, axis=1, out=out[:, 0])
+        np.max(blocks, axis=1, out=out[:, 1])
+    y_d = y_d.reshape(2, 2 * m)
+    return np.repeat(x[stride // 2:m * stride:stride], 2), y_d[0], y_d[1]
@@ -9,6 +9,8 @@ from matplotlib.figure import Figure
 from matplotlib.lines import Line2D
 from matplotlib import ticker as mticker
 
+from plot_decimate import decimate_dual
+
 
 class PlotterWidget(QtWidgets.QWidget):
     def __init__(self, parent=None):
@@ -19,11 +21,23 @@ class PlotterWidget(QtWidgets.QWidget):
         self.canvas = FigureCanvas(Figure(figsize=(6, 3), dpi=100))
         self.ax = self.canvas.figure.add_subplot(111)
         self.ax.grid(True)
-        self.ax.set_ylim(-0.5, 0.5)
-        (self.line_a,) = self.ax.plot([], [], color='c', linewidth=1, label='Channel A')
-        (self.line_b,) = self.ax.plot([], [], color='m', linewidth=1, label='Channel B')
+        # Axis limits as last set; the cursor and trigger helpers read these instead of
+        # asking matplotlib (get_xlim/get_ylim) on every move
+        self._ylim: Tuple[float, float] = (-0.5, 0.5)
+        self.ax.set_ylim(*self._ylim)
+        # Limits are always set explicitly; skip autoscale bookkeeping on every set_data
+        self.ax.set_autoscale_on(False)
+        # Traces (and the trigger/cursor lines below) are animated: full draws skip them and
+        # frames, cursor and trigger moves blit them over a cached background
+        (self.line_a,) = self.ax.plot([], [], color='c', linewidth=1, label='Channel A', animated=True)
+        (self.line_b,) = self.ax.plot([], [], color='m', linewidth=1, label='Channel B', animated=True)
         self.ax.legend(loc='upper right')
         layout.addWidget(self.canvas, 1)
+        # Axes background without the animated lines; re-captured after every full draw (resize, limits)
+        self._bg = None
+        self._xlim: Tuple[float, float] | None = None
+        self._x_data: np.ndarray | None = None
+        self.canvas.mpl_connect('draw_event', self._on_draw)
 
         # Cursor state
         self._cursor_step_frac_x = 0.002
@@ -39,22 +53,31 @@ class PlotterWidget(QtWidgets.QWidget):
         xmin, xmax = self._current_xlim()
         ymin, ymax = self._current_ylim()
         self._trigger_line = Line2D([xmin, xmax], [self._trigger_value, self._trigger_value],
-                                     color="#000000", linestyle="-.", linewidth=1.2, alpha=0.9)
+                                     color="#000000", linestyle="-.", linewidth=1.2, alpha=0.9, animated=True)
         self.ax.add_line(self._trigger_line)
         # Now init cursors, which will call _update_cursor_artists()
         self._init_cursors()
 
     # ----- Public API -----
     def update_series(self, t: np.ndarray, ya_norm: np.ndarray, yb_norm: np.ndarray, max_points: int) -> None:
-        tt_d, ya_d = self._decimate(t, ya_norm, max_points)
-        _, yb_d = self._decimate(t, yb_norm, max_points)
-        self.line_a.set_data(tt_d, ya_d)
-        self.line_b.set_data(tt_d, yb_d)
+        tt_d, ya_d, yb_d = decimate_dual(t, ya_norm, yb_norm, max_points)
+        if tt_d is self._x_data:
+            # Same (cached, read-only) time axis as last frame: only y needs re-validating
+            self.line_a.set_ydata(ya_d)
+            self.line_b.set_ydata(yb_d)
+        else:
+            self._x_data = tt_d
+            self.line_a.set_data(tt_d, ya_d)
+            self.line_b.set_data(tt_d, yb_d)
         if len(tt_d) > 1:
-            self.ax.set_xlim(float(tt_d[0]), float(tt_d[-1]))
-        self.ax.set_ylim(-0.5, 0.5)
-        self._update_cursor_artists()
-        self.canvas.draw_idle()
+            xlim = (float(tt_d[0]), float(tt_d[-1]))
+            if xlim != self._xlim:
+                # Ticks and cursors move with the limits: needs a full draw
+                self._xlim = xlim
+                self.ax.set_xlim(*xlim)
+                self._update_cursor_artists()
+                self._bg = None
+        self._blit_traces()
 
     def apply_time_axis_format(self, window_s: float) -> None:
         if window_s < 1e-3:
@@ -80,7 +103,7 @@ class PlotterWidget(QtWidgets.QWidget):
             newy = min(max(newy, ymin), ymax)
             self._cursor_positions['h'][idx] = newy
         self._update_cursor_artists()
-        self.canvas.draw_idle()
+        self._blit_traces()
 
     def get_cursor_values(self) -> Tuple[float, float, float, float, float, float]:
         x1 = float(self._cursor_positions['v'][0])
@@ -98,7 +121,7 @@ class PlotterWidget(QtWidgets.QWidget):
         self._trigger_value = y
         xmin, xmax = self._current_xlim()
         self._trigger_line.set_data([xmin, xmax], [y, y])
-        self.canvas.draw_idle()
+        self._blit_traces()
 
     def move_trigger(self, direction: int) -> None:
         ymin, ymax = self._current_ylim()
@@ -109,12 +132,26 @@ class PlotterWidget(QtWidgets.QWidget):
         return float(self._trigger_value)
 
     # ----- Internals -----
-    def _decimate(self, x: np.ndarray, y: np.ndarray, max_points: int):
-        n = len(x)
-        if n <= max_points:
-            return x, y
-        idx = np.linspace(0, n - 1, max_points, dtype=np.int32)
-        return x[idx], y[idx]
+    def _on_draw(self, event) -> None:
+        self._bg = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self) -> None:
+        # Traces, then trigger and cursors on top; none of them are in the background
+        self.ax.draw_artist(self.line_a)
+        self.ax.draw_artist(self.line_b)
+        self.ax.draw_artist(self._trigger_line)
+        for line in self._cursor_lines_v + self._cursor_lines_h:
+            self.ax.draw_artist(line)
+
+    def _blit_traces(self) -> None:
+        if self._bg is None:
+            # No valid background yet; _on_draw captures it and paints the animated lines
+            self.canvas.draw_idle()
+            return
+        self.canvas.restore_region(self._bg)
+        self._draw_animated()
+        self.canvas.blit(self.ax.bbox)
 
     def _init_cursors(self) -> None:
         xmin, xmax = self._current_xlim()
@@ -127,27 +164,24 @@ class PlotterWidget(QtWidgets.QWidget):
         self._cursor_positions['h'][1] = ymin + 0.75 * yr
 
         for color in ["#2ca02c", "#ff7f0e"]:
-            line = Line2D([0, 0], [ymin, ymax], color=color, linestyle="--", linewidth=1.0, alpha=0.9)
+            line = Line2D([0, 0], [ymin, ymax], color=color, linestyle="--", linewidth=1.0, alpha=0.9, animated=True)
             self.ax.add_line(line)
             self._cursor_lines_v.append(line)
         # Use neutral grays for Y cursors to avoid confusion with channel colors
         for color in ["#4d4d4d", "#7f7f7f"]:
-            line = Line2D([xmin, xmax], [0, 0], color=color, linestyle=":", linewidth=1.0, alpha=0.9)
+            line = Line2D([xmin, xmax], [0, 0], color=color, linestyle=":", linewidth=1.0, alpha=0.9, animated=True)
             self.ax.add_line(line)
             self._cursor_lines_h.append(line)
         self._update_cursor_artists()
 
     def _current_xlim(self) -> Tuple[float, float]:
-        xmin, xmax = self.ax.get_xlim()
-        if not np.isfinite(xmin) or not np.isfinite(xmax) or xmin == xmax:
+        # No data yet (or a single-sample frame never set the limits): default (0, 1) axes
+        if self._xlim is None or not self._xlim[0] < self._xlim[1]:
             return 0.0, 1.0
-        return float(xmin), float(xmax)
+        return self._xlim
 
     def _current_ylim(self) -> Tuple[float, float]:
-        ymin, ymax = self.ax.get_ylim()
-        if not np.isfinite(ymin) or not np.isfinite(ymax) or ymin == ymax:
-            return -0.5, 0.5
-        return float(ymin), float(ymax)
+        return self._ylim
 
     def _update_cursor_artists(self) -> None:
         xmin, xmax = self._current_xlim()
@@ -0,0 +1,166 @@
+from __future__ import annotations
+
+from typing import Tuple
+
+import numpy as np
+import pyqtgraph as pg
+from PyQt5 import QtCore, QtWidgets
+
+from plot_decimate import decimate_dual
+
+try:
+    import OpenGL  # noqa: F401  (PyOpenGL; pyqtgraph needs it to rasterize on the GPU)
+    _USE_OPENGL = True
+except ImportError:
+    _USE_OPENGL = False
+
+pg.setConfigOptions(antialias=False, useOpenGL=_USE_OPENGL)
+
+
+class PlotterWidget(QtWidgets.QWidget):
+    """pyqtgraph version of plotter.PlotterWidget with the same public API."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        # Named `canvas` like the matplotlib widget so callers can parent overlays to it
+        self.canvas = pg.PlotWidget(background='w')
+        self.plot_item = self.canvas.getPlotItem()
+        self.plot_item.showGrid(x=True, y=True)
+        self.plot_item.setMouseEnabled(x=False, y=False)
+        self.plot_item.hideButtons()
+        # Only build paths for the visible span, peak-downsampled to the pixel width
+        self.plot_item.setClipToView(True)
+        self.plot_item.setDownsampling(ds=True, auto=True, mode='peak')
+        self._xlim: Tuple[float, float] = (0.0, 1.0)
+        self._ylim: Tuple[float, float] = (-0.5, 0.5)
+        self.plot_item.setXRange(*self._xlim, padding=0)
+        self.plot_item.setYRange(*self._ylim, padding=0)
+        self.plot_item.addLegend(offset=(-10, 10))
+        self.line_a = self.plot_item.plot([], [], pen=pg.mkPen('c', width=1), name='Channel A')
+        self.line_b = self.plot_item.plot([], [], pen=pg.mkPen('m', width=1), name='Channel B')
+        layout.addWidget(self.canvas, 1)
+
+        # Cursor state
+        self._cursor_step_frac_x = 0.002
+        self._cursor_step_frac_y = 0.008
+        self._cursor_positions = {
+            'v': [0.0, 0.0],  # x positions (X1, X2)
+            'h': [-0.25, 0.25],  # y positions (Y1, Y2); initial default, will be reset
+        }
+        self._cursor_lines_v: list[pg.InfiniteLine] = []
+        self._cursor_lines_h: list[pg.InfiniteLine] = []
+        # Trigger indicator (horizontal line at normalized y); infinite lines span the view on their own
+        self._trigger_value: float = 0.0
+        self._trigger_line = pg.InfiniteLine(
+            pos=self._trigger_value, angle=0, movable=False,
+            pen=pg.mkPen('#000000', width=1.2, style=QtCore.Qt.DashDotLine),
+        )
+        self.plot_item.addItem(self._trigger_line)
+        self._init_cursors()
+
+    # ----- Public API -----
+    def update_series(self, t: np.ndarray, ya_norm: np.ndarray, yb_norm: np.ndarray, max_points: int) -> None:
+        tt_d, ya_d, yb_d = decimate_dual(t, ya_norm, yb_norm, max_points)
+        # Scaled int16 counts are always finite, so skip pyqtgraph's per-call NaN scan
+        self.line_a.setData(tt_d, ya_d, skipFiniteCheck=True)
+        self.line_b.setData(tt_d, yb_d, skipFiniteCheck=True)
+        if len(tt_d) > 1:
+            xlim = (float(tt_d[0]), float(tt_d[-1]))
+            if xlim != self._xlim:
+                self._xlim = xlim
+                self.plot_item.setXRange(*xlim, padding=0)
+                self._update_cursor_artists()
+
+    def apply_time_axis_format(self, window_s: float) -> None:
+        axis = self.plot_item.getAxis('bottom')
+        axis.enableAutoSIPrefix(False)
+        if window_s < 1e-3:
+            axis.setScale(1e6)
+            self.plot_item.setLabel('bottom', "Time (µs)")
+        else:
+            axis.setScale(1e3)
+            self.plot_item.setLabel('bottom', "Time (ms)")
+        self._update_cursor_artists()
+
+    def move_cursor(self, kind: str, idx: int, direction: int) -> None:
+        xmin, xmax = self._current_xlim()
+        ymin, ymax = self._current_ylim()
+        if kind == 'v':
+            step = self._cursor_step_frac_x * (xmax - xmin)
+            newx = float(self._cursor_positions['v'][idx]) + float(direction) * step
+            newx = min(max(newx, xmin), xmax)
+            self._cursor_positions['v'][idx] = newx
+        else:
+            step = self._cursor_step_frac_y * (ymax - ymin)
+            newy = float(self._cursor_positions['h'][idx]) + float(direction) * step
+            newy = min(max(newy, ymin), ymax)
+            self._cursor_positions['h'][idx] = newy
+        self._update_cursor_artists()
+
+    def get_cursor_values(self) -> Tuple[float, float, float, float, float, float]:
+        x1 = float(self._cursor_positions['v'][0])
+        x2 = float(self._cursor_positions['v'][1])
+        y1 = float(self._cursor_positions['h'][0])
+        y2 = float(self._cursor_positions['h'][1])
+        dx = abs(x2 - x1)
+        dy = abs(y2 - y1)
+        return x1, x2, y1, y2, dx, dy
+
+    # Trigger helpers
+    def set_trigger_level_norm(self, y: float) -> None:
+        ymin, ymax = self._current_ylim()
+        y = float(min(max(y, ymin), ymax))
+        self._trigger_value = y
+        self._trigger_line.setValue(y)
+
+    def move_trigger(self, direction: int) -> None:
+        ymin, ymax = self._current_ylim()
+        step = self._cursor_step_frac_y * (ymax - ymin)
+        self.set_trigger_level_norm(self._trigger_value + float(direction) * step)
+
+    def get_trigger_level_norm(self) -> float:
+        return float(self._trigger_value)
+
+    # ----- Internals -----
+    def _init_cursors(self) -> None:
+        xmin, xmax = self._current_xlim()
+        ymin, ymax = self._current_ylim()
+        xr = xmax - xmin
+        yr = ymax - ymin
+        self._cursor_positions['v'][0] = xmin + 0.25 * xr
+        self._cursor_positions['v'][1] = xmin + 0.75 * xr
+        self._cursor_positions['h'][0] = ymin + 0.25 * yr
+        self._cursor_positions['h'][1] = ymin + 0.75 * yr
+
+        for color in ["#2ca02c", "#ff7f0e"]:
+            line = pg.InfiniteLine(angle=90, movable=False, pen=pg.mkPen(color, width=1.0, style=QtCore.Qt.DashLine))
+            self.plot_item.addItem(line)
+            self._cursor_lines_v.append(line)
+        # Use neutral grays for Y cursors to avoid confusion with channel colors
+        for color in ["#4d4d4d", "#7f7f7f"]:
+            line = pg.InfiniteLine(angle=0, movable=False, pen=pg.mkPen(color, width=1.0, style=QtCore.Qt.DotLine))
+            self.plot_item.addItem(line)
+            self._cursor_lines_h.append(line)
+        self._update_cursor_artists()
+
+    def _current_xlim(self) -> Tuple[float, float]:
+        # Ranges are only ever set from here, so track them instead of querying the view box
+        return self._xlim
+
+    def _current_ylim(self) -> Tuple[float, float]:
+        return self._ylim
+
+    def _update_cursor_artists(self) -> None:
+        xmin, xmax = self._current_xlim()
+        ymin, ymax = self._current_ylim()
+        for i, line in enumerate(self._cursor_lines_v):
+            x = float(self._cursor_positions['v'][i])
+            line.setValue(min(max(x, xmin), xmax))
+        for i, line in enumerate(self._cursor_lines_h):
+            y = float(self._cursor_positions['h'][i])
+            line.setValue(min(max(y, ymin), ymax))
+        # Update trigger indicator
+        self._trigger_line.setValue(float(min(max(self._trigger_value, ymin), ymax)))